@@ -2,19 +2,116 @@
 """
 PostgreSQL Database Manager with NiceGUI
 Provides a web interface for dumping and restoring PostgreSQL databases.
+
+Dumps are compressed at the per-connection `compress_level` (default 1),
+passed to pg_dump as -Z. Use 0-9 for gzip or e.g. "zstd:3" with pg_dump 16+.
 """
 
 import asyncio
+import functools
 import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
 import tomllib
-from datetime import datetime
+from collections import defaultdict, deque
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, List, Tuple
 
-import psycopg
-from nicegui import ui
+from nicegui import app, ui
 from nicegui.element import Element
 
+if TYPE_CHECKING:
+    # psycopg is imported on first use to keep startup fast
+    from psycopg_pool import AsyncConnectionPool
+
+# Host platform, checked once instead of calling platform.system() per click
+PLATFORM = sys.platform
+
+# Client binaries, resolved once instead of searching PATH on every run
+PG_DUMP = shutil.which("pg_dump") or "pg_dump"
+PG_RESTORE = shutil.which("pg_restore") or "pg_restore"
+
+# Session settings for pg_restore, passed via PGOPTIONS
+DEFAULT_PG_RESTORE_OPTIONS = (
+    "-c synchronous_commit=off "
+    "-c maintenance_work_mem=256MB "
+    "-c max_parallel_maintenance_workers=4"
+)
+
+# Drops and recreates the public schema, keeping its owner and privileges
+# (on PostgreSQL 15+ it belongs to pg_database_owner and PUBLIC may not CREATE)
+CLEAN_PUBLIC_SCHEMA_SQL = """
+DO $$
+DECLARE
+    schema_owner text;
+    schema_acl aclitem[];
+    item record;
+BEGIN
+    SELECT nspowner::regrole::text, nspacl INTO schema_owner, schema_acl
+    FROM pg_namespace WHERE nspname = 'public';
+    DROP SCHEMA IF EXISTS public CASCADE;
+    EXECUTE format(
+        'CREATE SCHEMA public AUTHORIZATION %s',
+        coalesce(schema_owner, 'CURRENT_USER')
+    );
+    FOR item IN SELECT * FROM aclexplode(schema_acl) LOOP
+        EXECUTE format(
+            'GRANT %s ON SCHEMA public TO %s%s',
+            item.privilege_type,
+            CASE item.grantee
+                WHEN 0 THEN 'PUBLIC'
+                ELSE item.grantee::regrole::text
+            END,
+            CASE WHEN item.is_grantable THEN ' WITH GRANT OPTION' ELSE '' END
+        );
+    END LOOP;
+END
+$$
+"""
+
+# Bytes read from pg_dump/pg_restore stderr per wakeup
+STDERR_CHUNK_SIZE = 65536
+
+# Progress keywords in pg_dump --verbose output, matched on raw stderr lines
+DUMP_PROGRESS_RE = re.compile(
+    rb"dumping contents of table|processing item|reading (?:schemas|extensions"
+    rb"|types|user-defined tables|indexes|constraints)",
+    re.IGNORECASE,
+)
+
+# Status bar text for pg_dump phases that carry no details
+DUMP_PHASE_STATUS = {
+    b"reading schemas": "Dumping database... [Reading database schema]",
+    b"reading extensions": "Dumping database... [Reading extensions]",
+    b"reading types": "Dumping database... [Reading custom types]",
+    b"reading user-defined tables": "Dumping database... [Reading table structures]",
+    b"reading indexes": "Dumping database... [Reading indexes]",
+    b"reading constraints": "Dumping database... [Reading constraints]",
+}
+
+# Progress keywords in pg_restore --verbose output
+RESTORE_PROGRESS_RE = re.compile(
+    rb"processing item|creating table|restoring data for table|creating index",
+    re.IGNORECASE,
+)
+
+# Minimum seconds between progress updates of the status bar
+STATUS_UPDATE_INTERVAL = 0.1
+
+# Number of pg_dump/pg_restore stderr lines kept for error reporting
+STDERR_TAIL_LINES = 500
+
+# Tailwind classes of the Open Dump Folder button, shared by every page build
+SECONDARY_BUTTON_CLASSES = "mt-4 bg-gray-600 hover:bg-gray-700 text-white px-6 py-2 rounded-lg transition-colors"
+
+# Parsed connections per config path, keyed on (st_mtime_ns, st_size)
+_CONFIG_CACHE: dict[Path, tuple[int, int, dict]] = {}
+
 
 class PostgresManager:
     def __init__(self):
@@ -31,12 +128,109 @@ class PostgresManager:
         self.status_footer = None
         self.loading_overlay: Element | None = None
 
+        # Sorted dump file names per directory, keyed on directory mtime and
+        # the file extensions listed
+        self._dump_cache: dict[Path, tuple[int, Tuple[str, ...], List[str]]] = {}
+
+        # Connection pools per connection name, opened lazily on first use
+        self._pools: dict[str, "AsyncConnectionPool"] = {}
+
+        # pg_dump/pg_restore environments per connection name
+        self._child_envs: dict[str, dict[str, str]] = {}
+
+        # Private pgpass files written for those environments
+        self._pgpass_files: List[str] = []
+
+        # Serializes dumps and restores per connection name
+        self._connection_locks: defaultdict[str, asyncio.Lock] = defaultdict(
+            asyncio.Lock
+        )
+
     def load_config(self):
         """Load database connections from config.toml"""
         try:
-            with open(self.config_path, "rb") as f:
-                config = tomllib.load(f)
-                self.connections = config.get("connections", {})
+            st = self.config_path.stat()
+            cached = _CONFIG_CACHE.get(self.config_path)
+            if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+                self.connections = cached[2]
+            else:
+                with open(self.config_path, "rb") as f:
+                    config = tomllib.load(f)
+                    self.connections = config.get("connections", {})
+
+                # Precompute pg_dump/pg_restore arguments up to the target file
+                for name, conn_config in self.connections.items():
+                    base_args = (
+                        "-h",
+                        conn_config.get("host", "localhost"),
+                        "-p",
+                        str(conn_config.get("port", 5432)),
+                        "-U",
+                        conn_config.get("user", "postgres"),
+                        "-d",
+                        conn_config.get("dbname"),
+                    )
+                    jobs = self.get_jobs(name)
+                    if jobs > 1:
+                        # Directory format, parallel
+                        format_args = ("-Fd", "-j", str(jobs))
+                    else:
+                        format_args = ("-Fc",)  # Custom format
+
+                    conn_config["_dump_argv_template"] = (
+                        PG_DUMP,
+                        *base_args,
+                        *format_args,
+                        "-Z",
+                        str(conn_config.get("compress_level", "1")),
+                        "--verbose",  # Enable verbose output for progress tracking
+                    )
+                    # compress_cmd may be given as a list or a shell-style string
+                    if isinstance(conn_config.get("compress_cmd"), str):
+                        conn_config["compress_cmd"] = shlex.split(
+                            conn_config["compress_cmd"]
+                        )
+                    # Uncompressed custom format for piping into compress_cmd
+                    conn_config["_piped_dump_argv_template"] = (
+                        PG_DUMP,
+                        *base_args,
+                        "-Fc",
+                        "-Z",
+                        "0",
+                        "--verbose",
+                    )
+                    if conn_config.get("single_txn"):
+                        # One transaction for the whole restore; pg_restore
+                        # does not allow it together with parallel jobs
+                        restore_args = ("--single-transaction",)
+                        piped_restore_args = restore_args
+                    else:
+                        restore_args = ("-j", str(jobs))
+                        piped_restore_args = ()
+                    conn_config["_restore_argv_template"] = (
+                        PG_RESTORE,
+                        *base_args,
+                        "--no-owner",
+                        "--no-privileges",
+                        *restore_args,
+                        "--verbose",  # Enable verbose output for progress tracking
+                    )
+                    # Restores from stdin for decompressed piped dumps, which
+                    # pg_restore cannot run with parallel jobs
+                    conn_config["_piped_restore_argv_template"] = (
+                        PG_RESTORE,
+                        *base_args,
+                        "--no-owner",
+                        "--no-privileges",
+                        *piped_restore_args,
+                        "--verbose",
+                    )
+
+                _CONFIG_CACHE[self.config_path] = (
+                    st.st_mtime_ns,
+                    st.st_size,
+                    self.connections,
+                )
         except FileNotFoundError:
             ui.notify("config.toml not found", type="negative")
             self.connections = {}
@@ -44,9 +238,11 @@ class PostgresManager:
             ui.notify(f"Error loading config: {e}", type="negative")
             self.connections = {}
 
-    def get_connection_names(self) -> List[str]:
-        """Get list of connection names"""
-        return list(self.connections.keys())
+        self._connection_names = tuple(self.connections.keys())
+
+    def get_connection_names(self) -> Tuple[str, ...]:
+        """Get connection names (cached at config load)"""
+        return self._connection_names
 
     def is_restore_prevented(self, connection_name: str) -> bool:
         """Check if restore is prevented for a connection"""
@@ -54,6 +250,104 @@ class PostgresManager:
             return False
         return self.connections[connection_name].get("prevent_restore", False)
 
+    def get_jobs(self, connection_name: str) -> int:
+        """Get number of parallel pg_dump/pg_restore workers for a connection"""
+        conn_config = self.connections[connection_name]
+        if not conn_config.get("parallel", True):
+            return 1
+        # Each worker holds its own server connection, so stay modest by default
+        default = min(os.cpu_count() or 1, 4)
+        return max(int(conn_config.get("jobs", default)), 1)
+
+    def get_compressed_extension(self, connection_name: str) -> str | None:
+        """Get the file extension of piped dumps, or None without compress_cmd"""
+        conn_config = self.connections[connection_name]
+        if not conn_config.get("compress_cmd"):
+            return None
+        return ".dump" + conn_config.get("compress_suffix", ".zst")
+
+    async def get_pool(self, connection_name: str) -> "AsyncConnectionPool":
+        """Get (and open on first use) the connection pool for a connection"""
+        pool = self._pools.get(connection_name)
+        if pool is None:
+            from psycopg import AsyncConnection
+            from psycopg.conninfo import make_conninfo
+            from psycopg_pool import AsyncConnectionPool
+
+            conn_config = self.connections[connection_name]
+            keepalives = conn_config.get("keepalives")
+            if isinstance(keepalives, bool):
+                # libpq expects 0 or 1, TOML naturally gives true/false
+                keepalives = int(keepalives)
+            conn_str = make_conninfo(
+                host=conn_config.get("host", "localhost"),
+                port=conn_config.get("port", 5432),
+                user=conn_config.get("user"),
+                password=conn_config.get("password"),
+                dbname=conn_config.get("dbname"),
+                connect_timeout=5,
+                application_name="postgres-manager",
+                # Optional libpq settings, omitted when None
+                sslmode=conn_config.get("sslmode"),
+                target_session_attrs=conn_config.get("target_session_attrs"),
+                keepalives=keepalives,
+            )
+            # Connect once directly so a bad host or password raises libpq's
+            # own error instead of a pool timeout
+            conn = await AsyncConnection.connect(conn_str)
+            await conn.close()
+
+            # No connections are kept open beyond max_idle between cleans
+            pool = AsyncConnectionPool(
+                conn_str, min_size=0, max_size=2, timeout=10, open=False
+            )
+            await pool.open(wait=True)
+            self._pools[connection_name] = pool
+        return pool
+
+    async def discard_pool(self, connection_name: str):
+        """Close and forget the connection pool of a connection"""
+        pool = self._pools.pop(connection_name, None)
+        if pool is not None:
+            await pool.close()
+
+    async def close_pools(self):
+        """Close all open connection pools"""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        await asyncio.shield(asyncio.gather(*(pool.close() for pool in pools)))
+
+    def get_child_env(self, connection_name: str) -> dict[str, str]:
+        """Get environment for pg_dump/pg_restore of a connection"""
+        env = self._child_envs.get(connection_name)
+        if env is None:
+            env = dict(os.environ)
+            env["PGCONNECT_TIMEOUT"] = "5"
+
+            # Without a configured password libpq falls back to the user's own
+            # PGPASSWORD, PGPASSFILE or ~/.pgpass
+            password = self.connections[connection_name].get("password")
+            if password:
+                # Keep the password out of the child environment, which other
+                # processes of the same user can read via /proc/<pid>/environ
+                escaped = password.replace("\\", "\\\\").replace(":", "\\:")
+                fd, pgpass_path = tempfile.mkstemp(prefix="pgpass-")  # Mode 0600
+                with os.fdopen(fd, "w") as f:
+                    f.write(f"*:*:*:*:{escaped}\n")
+                self._pgpass_files.append(pgpass_path)
+
+                env.pop("PGPASSWORD", None)
+                env["PGPASSFILE"] = pgpass_path
+            self._child_envs[connection_name] = env
+        return env
+
+    def remove_pgpass_files(self):
+        """Remove pgpass files written for child processes"""
+        for pgpass_path in self._pgpass_files:
+            Path(pgpass_path).unlink(missing_ok=True)
+        self._pgpass_files.clear()
+        self._child_envs.clear()
+
     def reset_status_bar(self):
         """Reset status bar to normal state"""
         if self.status_label:
@@ -61,9 +355,46 @@ class PostgresManager:
         if self.status_footer:
             self.status_footer.classes(replace="p-4")
 
+    def throttle_status(self) -> Tuple[Callable[[str], None], Callable[[], None]]:
+        """Get a rate-limited status bar setter and a function cancelling it"""
+        loop = asyncio.get_running_loop()
+        last_ui = 0.0
+        shown = None
+        pending = None
+        handle: asyncio.TimerHandle | None = None
+
+        def flush():
+            nonlocal last_ui, shown, handle
+            handle = None
+            self.status_label.text = shown = pending
+            last_ui = loop.time()
+
+        def update(status: str):
+            nonlocal pending, handle
+            pending = status
+            # Repeated text does not use up an update slot; text arriving too
+            # soon is shown once the interval has passed, unless replaced
+            if handle or status == shown:
+                return
+            delay = last_ui + STATUS_UPDATE_INTERVAL - loop.time()
+            if delay <= 0:
+                flush()
+            else:
+                handle = loop.call_later(delay, flush)
+
+        def stop():
+            if handle:
+                handle.cancel()
+
+        return update, stop
+
     def show_loading_overlay(self):
         """Show loading overlay with spinner"""
         if self.loading_overlay:
+            # The spinner is only built the first time it is needed
+            if not self.loading_overlay.default_slot.children:
+                with self.loading_overlay:
+                    ui.spinner("dots", size="xl", color="white")
             self.loading_overlay.set_visibility(True)
 
     def hide_loading_overlay(self):
@@ -86,231 +417,318 @@ class PostgresManager:
         dump_path = Path(
             self.connections[connection_name].get("dump_path", ".")
         ).expanduser()
-        if not dump_path.exists():
+        # Piped dumps are only listed while their compressor is configured
+        compressed_extension = self.get_compressed_extension(connection_name)
+        if compressed_extension:
+            file_extensions = (".dump", compressed_extension)
+        else:
+            file_extensions = (".dump",)
+        try:
+            mtime = dump_path.stat().st_mtime_ns
+            cached = self._dump_cache.get(dump_path)
+            if cached and cached[:2] == (mtime, file_extensions):
+                return cached[2]
+
+            with os.scandir(dump_path) as entries:
+                dump_files = [
+                    entry.name
+                    for entry in entries
+                    if (
+                        entry.name.endswith(file_extensions)
+                        and entry.is_file(follow_symlinks=False)
+                    )
+                    or (
+                        entry.name.endswith(".pgd")
+                        and entry.is_dir(follow_symlinks=False)
+                    )
+                ]
+        except FileNotFoundError:
             return []
 
-        dump_files = []
-        for file in dump_path.glob("*.dump"):
-            dump_files.append(file.name)
-
-        return sorted(dump_files, reverse=True)  # Most recent first
+        dump_files.sort(reverse=True)  # Most recent first
+        self._dump_cache[dump_path] = (mtime, file_extensions, dump_files)
+        return dump_files
 
     def generate_dump_name(self, connection_name: str) -> str:
         """Generate default dump name"""
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = time.localtime()
+        timestamp = (
+            f"{now.tm_year:04d}{now.tm_mon:02d}{now.tm_mday:02d}"
+            f"_{now.tm_hour:02d}{now.tm_min:02d}{now.tm_sec:02d}"
+        )
         return f"{connection_name}_dump_{timestamp}"
 
+    async def wait_for_process(
+        self, process: asyncio.subprocess.Process, timeout: float | None
+    ) -> bool:
+        """Wait for a child process, stopping it if it runs longer than timeout seconds"""
+        if timeout is None:
+            await process.wait()
+            return True
+        try:
+            await asyncio.wait_for(process.wait(), timeout=timeout)
+            return True
+        except TimeoutError:
+            try:
+                process.terminate()
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=5)
+                except TimeoutError:
+                    process.kill()
+                    await process.wait()
+            except ProcessLookupError:
+                # Exited on its own just as the limit was reached
+                await process.wait()
+            return False
+
+    async def wait_while_reading(
+        self,
+        process: asyncio.subprocess.Process,
+        read_stderr: Callable[[], Awaitable[None]],
+        timeout: float | None,
+    ) -> bool:
+        """Wait for a child process (see wait_for_process) while read_stderr runs"""
+        # A plain task instead of a TaskGroup, so errors reach the caller as
+        # they are rather than wrapped in an ExceptionGroup
+        reader = asyncio.create_task(read_stderr())
+        try:
+            finished = await self.wait_for_process(process, timeout)
+        except BaseException:
+            reader.cancel()
+            raise
+        await reader
+        return finished
+
     async def dump_database(self, connection_name: str, dump_name: str):
         """Dump database using pg_dump"""
         if connection_name not in self.connections:
             ui.notify("Invalid connection", type="negative")
             return
 
-        conn_config = self.connections[connection_name]
-        dump_path = Path(conn_config.get("dump_path", ".")).expanduser()
-
-        # Ensure dump directory exists
-        dump_path.mkdir(parents=True, exist_ok=True)
-
-        # Add .dump extension if not present
-        if not dump_name.endswith(".dump"):
-            dump_name += ".dump"
-
-        dump_file = dump_path / dump_name
-
-        # Build pg_dump command with verbose output
-        cmd = [
-            "pg_dump",
-            "-h",
-            conn_config.get("host", "localhost"),
-            "-p",
-            str(conn_config.get("port", 5432)),
-            "-U",
-            conn_config.get("user", "postgres"),
-            "-d",
-            conn_config.get("dbname"),
-            "-Fc",  # Custom format
-            "--verbose",  # Enable verbose output for progress tracking
-            "-f",
-            str(dump_file),
-        ]
-
-        # Set environment variables
-        env = os.environ.copy()
-        env["PGPASSWORD"] = conn_config.get("password", "")
-
-        try:
-            self.show_loading_overlay()
-            self.status_label.text = (
-                f"Preparing to dump database {conn_config.get('dbname')}..."
-            )
-            await asyncio.sleep(0.1)  # Allow UI to update
-
-            # Start the process
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                env=env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+        lock = self._connection_locks[connection_name]
+        if lock.locked():
+            ui.notify(
+                f"A dump or restore of {connection_name} is already running",
+                type="warning",
             )
+            return
 
-            # Monitor progress by reading stderr line by line (pg_dump outputs progress to stderr)
-            stderr_output = []
-            table_count = 0
-            processed_items = 0
+        async with lock:
+            conn_config = self.connections[connection_name]
+            dump_path = Path(conn_config.get("dump_path", ".")).expanduser()
 
-            async def read_stderr():
-                nonlocal table_count, processed_items
-                try:
-                    while True:
-                        line = await process.stderr.readline()
-                        if not line:
-                            break
-
-                        line_str = line.decode().strip()
-                        if line_str:  # Only process non-empty lines
-                            stderr_output.append(line_str)
-
-                            # Parse progress from pg_dump verbose output
-                            if "dumping contents of table" in line_str.lower():
-                                table_count += 1
-                                # Extract table name for data dumping
-                                parts = line_str.split('"')
-                                table_name = parts[1] if len(parts) > 1 else "unknown"
-                                self.status_label.text = f"Dumping database... [Exporting data from {table_name}] ({table_count} tables)"
-                                await asyncio.sleep(0.01)
-                            elif "processing item" in line_str.lower():
-                                processed_items += 1
-                                self.status_label.text = f"Dumping database... [Processing item {processed_items}]"
-                                await asyncio.sleep(0.01)
-                            elif "reading schemas" in line_str.lower():
-                                self.status_label.text = (
-                                    "Dumping database... [Reading database schema]"
-                                )
-                                await asyncio.sleep(0.01)
-                            elif "reading extensions" in line_str.lower():
-                                self.status_label.text = (
-                                    "Dumping database... [Reading extensions]"
-                                )
-                                await asyncio.sleep(0.01)
-                            elif "reading types" in line_str.lower():
-                                self.status_label.text = (
-                                    "Dumping database... [Reading custom types]"
-                                )
-                                await asyncio.sleep(0.01)
-                            elif "reading user-defined tables" in line_str.lower():
-                                self.status_label.text = (
-                                    "Dumping database... [Reading table structures]"
-                                )
-                                await asyncio.sleep(0.01)
-                            elif "reading indexes" in line_str.lower():
-                                self.status_label.text = (
-                                    "Dumping database... [Reading indexes]"
-                                )
-                                await asyncio.sleep(0.01)
-                            elif "reading constraints" in line_str.lower():
-                                self.status_label.text = (
-                                    "Dumping database... [Reading constraints]"
-                                )
-                                await asyncio.sleep(0.01)
-                except Exception as e:
-                    print(f"Error reading stderr: {e}")
-
-            # Start reading stderr in background
-            stderr_task = asyncio.create_task(read_stderr())
-
-            # Wait for process to complete (only read stdout, stderr is handled above)
-            await process.stdout.read()  # Consume stdout to prevent blocking
-
-            # Wait for process to finish
-            await process.wait()
+            # Ensure dump directory exists
+            dump_path.mkdir(parents=True, exist_ok=True)
 
-            # Wait for stderr reading to complete
-            await stderr_task
+            # Parallel dumps need the directory format, stored as <name>.pgd;
+            # piped dumps get the compressor's suffix
+            compress_cmd = conn_config.get("compress_cmd")
+            if compress_cmd:
+                extension = self.get_compressed_extension(connection_name)
+            elif self.get_jobs(connection_name) > 1:
+                extension = ".pgd"
+            else:
+                extension = ".dump"
 
-            if process.returncode == 0:
-                ui.notify(
-                    f"Database dumped successfully to {dump_name}", type="positive"
-                )
-                self.status_label.text = f"Dump completed: {dump_name} - {table_count} tables exported, {processed_items} items processed"
-                # Refresh dump list if in restore mode
-                if hasattr(self, "restore_dropdown") and self.restore_dropdown:
-                    self.refresh_restore_dropdown()
-                # Refresh dump name for next dump
-                self.refresh_dump_name()
+            # Replace a dump extension typed by the user, so that "foo.dump"
+            # does not become "foo.dump.pgd"
+            for known_extension in (extension, ".pgd", ".dump"):
+                if dump_name.endswith(known_extension):
+                    dump_name = dump_name.removesuffix(known_extension)
+                    break
+            dump_name += extension
+
+            dump_file = dump_path / dump_name
+
+            # Build pg_dump command with verbose output
+            if compress_cmd:
+                cmd = conn_config["_piped_dump_argv_template"]
             else:
-                # Join stderr output for error logging
-                full_error = "\n".join(stderr_output)
-                print("Full dump error output:", full_error)
-                ui.notify("Dump failed: Check console for details", type="negative")
-                self.status_label.text = "Dump failed - check console for details"
+                cmd = (*conn_config["_dump_argv_template"], "-f", str(dump_file))
 
-            self.hide_loading_overlay()
+            # Password is passed through a private pgpass file
+            env = self.get_child_env(connection_name)
 
-        except Exception as e:
-            ui.notify(f"Error during dump: {e}", type="negative")
-            self.status_label.text = f"Error during dump: {e}"
-            self.hide_loading_overlay()
+            try:
+                self.show_loading_overlay()
+                self.status_label.text = (
+                    f"Preparing to dump database {conn_config.get('dbname')}..."
+                )
+                await asyncio.sleep(0)  # Allow UI to update
+
+                # Start the process
+                compressor = None
+                if compress_cmd:
+                    # Pipe pg_dump straight into the compressor instead of
+                    # writing an uncompressed dump to disk first
+                    read_fd, write_fd = os.pipe()
+                    try:
+                        with open(dump_file, "wb") as out:
+                            compressor = await asyncio.create_subprocess_exec(
+                                *compress_cmd, stdin=read_fd, stdout=out
+                            )
+                        process = await asyncio.create_subprocess_exec(
+                            *cmd,
+                            env=env,
+                            stdout=write_fd,
+                            stderr=asyncio.subprocess.PIPE,
+                        )
+                    except Exception:
+                        # Do not leave an empty dump behind
+                        dump_file.unlink(missing_ok=True)
+                        raise
+                    finally:
+                        # The children hold their own copies of the pipe ends
+                        os.close(read_fd)
+                        os.close(write_fd)
+                else:
+                    process = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        env=env,
+                        stdout=asyncio.subprocess.DEVNULL,  # Output goes to a file
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+
+                # Monitor progress by reading stderr line by line (pg_dump outputs progress to stderr)
+                stderr_output = deque(maxlen=STDERR_TAIL_LINES)
+                table_count = 0
+                processed_items = 0
+
+                async def read_stderr():
+                    nonlocal table_count, processed_items
+                    update_status, stop_status_updates = self.throttle_status()
+                    try:
+                        async for batch in read_line_batches(process.stderr):
+                            for line in batch:
+                                line = line.strip()
+                                if not line:  # Only process non-empty lines
+                                    continue
+                                # Kept as bytes, only decoded when reported
+                                stderr_output.append(line)
+
+                                # Parse progress from pg_dump verbose output
+                                status = None
+                                match = DUMP_PROGRESS_RE.search(line)
+                                keyword = match and match.group().lower()
+                                if keyword == b"dumping contents of table":
+                                    table_count += 1
+                                    # Extract table name for data dumping
+                                    parts = line.decode(errors="replace").split('"')
+                                    table_name = (
+                                        parts[1] if len(parts) > 1 else "unknown"
+                                    )
+                                    status = f"Dumping database... [Exporting data from {table_name}] ({table_count} tables)"
+                                elif keyword == b"processing item":
+                                    processed_items += 1
+                                    status = f"Dumping database... [Processing item {processed_items}]"
+                                elif keyword:
+                                    status = DUMP_PHASE_STATUS[keyword]
+
+                                # Coalesce UI updates instead of pausing the pump
+                                if status:
+                                    update_status(status)
+                    except Exception as e:
+                        print(f"Error reading stderr: {e}")
+                    finally:
+                        stop_status_updates()
+
+                # Read stderr while waiting for the process to finish, stopping
+                # it once the optional time limit is reached
+                timeout = conn_config.get("timeout")
+                started = time.monotonic()
+                finished = await self.wait_while_reading(process, read_stderr, timeout)
+
+                # The compressor exits once pg_dump closes its end of the pipe;
+                # it shares the time limit with pg_dump
+                if compressor:
+                    timeout_left = timeout
+                    if timeout is not None:
+                        timeout_left = max(timeout - (time.monotonic() - started), 0)
+                    finished &= await self.wait_for_process(compressor, timeout_left)
+                    if compressor.returncode != 0:
+                        stderr_output.append(
+                            f"{compress_cmd[0]} exited with code "
+                            f"{compressor.returncode}".encode()
+                        )
+
+                if process.returncode == 0 and (
+                    compressor is None or compressor.returncode == 0
+                ):
+                    ui.notify(
+                        f"Database dumped successfully to {dump_name}", type="positive"
+                    )
+                    self.status_label.text = f"Dump completed: {dump_name} - {table_count} tables exported, {processed_items} items processed"
+                    # Directory mtime may not have ticked yet, so drop the cached listing
+                    self._dump_cache.pop(dump_path, None)
+                    # Refresh dump list if in restore mode
+                    if self.restore_dropdown:
+                        self.refresh_restore_dropdown()
+                    # Refresh dump name for next dump
+                    self.refresh_dump_name()
+                else:
+                    # Join stderr tail for error logging
+                    full_error = b"\n".join(stderr_output).decode(errors="replace")
+                    print(
+                        f"Dump error output (last {STDERR_TAIL_LINES} lines):",
+                        full_error,
+                    )
+                    if compressor or not finished:
+                        # A truncated dump would be offered for restore. Other
+                        # failures are left alone: pg_dump refuses to write into
+                        # an existing directory, which may hold an older dump
+                        if dump_file.is_dir():
+                            shutil.rmtree(dump_file, ignore_errors=True)
+                        else:
+                            dump_file.unlink(missing_ok=True)
+                    if finished:
+                        ui.notify(
+                            "Dump failed: Check console for details", type="negative"
+                        )
+                        self.status_label.text = (
+                            "Dump failed - check console for details"
+                        )
+                    else:
+                        ui.notify(
+                            f"Dump timed out after {timeout} seconds", type="negative"
+                        )
+                        self.status_label.text = (
+                            f"Dump timed out after {timeout} seconds"
+                        )
+
+                self.hide_loading_overlay()
+
+            except Exception as e:
+                ui.notify(f"Error during dump: {e}", type="negative")
+                self.status_label.text = f"Error during dump: {e}"
+                self.hide_loading_overlay()
 
     async def clean_database(self, connection_name: str):
-        """Drop all tables in the database"""
+        """Drop and recreate the public schema"""
         if connection_name not in self.connections:
             return False
 
-        conn_config = self.connections[connection_name]
-
         try:
-            # Connect to database
-            conn_str = f"postgresql://{conn_config.get('user')}:{conn_config.get('password')}@{conn_config.get('host', 'localhost')}:{conn_config.get('port', 5432)}/{conn_config.get('dbname')}"
-
-            async with await psycopg.AsyncConnection.connect(conn_str) as conn:
+            # Borrow a pooled connection to the database
+            pool = await self.get_pool(connection_name)
+            async with pool.connection() as conn:
                 async with conn.cursor() as cur:
-                    self.status_label.text = "Scanning database tables..."
-                    await asyncio.sleep(0.1)  # Allow UI to update
-
-                    # Get all table names
-                    await cur.execute("""
-                        SELECT tablename FROM pg_tables 
-                        WHERE schemaname = 'public'
-                    """)
-                    tables = await cur.fetchall()
+                    self.status_label.text = "Dropping public schema..."
+                    await asyncio.sleep(0)  # Allow UI to update
 
-                    if tables:
-                        table_names = [table[0] for table in tables]
-                        total_tables = len(table_names)
+                    # Recreate the schema in one statement instead of dropping
+                    # tables one by one; also removes views, sequences and types
+                    await cur.execute(CLEAN_PUBLIC_SCHEMA_SQL)
+                    await conn.commit()
 
-                        self.status_label.text = (
-                            f"Found {total_tables} tables to drop..."
-                        )
-                        await asyncio.sleep(0.1)  # Allow UI to update
-
-                        # Drop tables one by one to show progress
-                        for i, table_name in enumerate(table_names, 1):
-                            self.status_label.text = f"Dropping tables... [{i}/{total_tables}] - {table_name}"
-                            await asyncio.sleep(0.05)  # Allow UI to update
-
-                            try:
-                                await cur.execute(
-                                    f'DROP TABLE IF EXISTS "{table_name}" CASCADE'
-                                )
-                                await conn.commit()
-                            except Exception as e:
-                                # Continue with other tables even if one fails
-                                print(
-                                    f"Warning: Failed to drop table {table_name}: {e}"
-                                )
-
-                        self.status_label.text = (
-                            f"Successfully dropped {total_tables} tables"
-                        )
-                        ui.notify(f"Dropped {total_tables} tables", type="info")
-                    else:
-                        self.status_label.text = "No tables found to drop"
+                    self.status_label.text = "Successfully dropped public schema"
+                    ui.notify("Dropped public schema", type="info")
 
             return True
 
         except Exception as e:
+            # Start over on the next clean, reporting connect errors again
+            await self.discard_pool(connection_name)
             ui.notify(f"Error cleaning database: {e}", type="negative")
             self.status_label.text = f"Error cleaning database: {e}"
             return False
@@ -323,140 +741,200 @@ class PostgresManager:
             ui.notify("Invalid connection", type="negative")
             return
 
-        conn_config = self.connections[connection_name]
-        dump_path = Path(conn_config.get("dump_path", ".")).expanduser()
-        dump_file_path = dump_path / dump_file
-
-        if not dump_file_path.exists():
-            ui.notify("Dump file not found", type="negative")
-            return
-
-        try:
-            self.show_loading_overlay()
-            self.status_label.text = (
-                f"Preparing to restore database {conn_config.get('dbname')}..."
-            )
-            await asyncio.sleep(0.1)  # Allow UI to update
-
-            # Clean database if requested
-            if clean_db:
-                self.status_label.text = "Cleaning database before restore..."
-                await asyncio.sleep(0.1)  # Allow UI to update
-                success = await self.clean_database(connection_name)
-                if not success:
-                    self.hide_loading_overlay()
-                    return
-
-            # Build pg_restore command with verbose output
-            cmd = [
-                "pg_restore",
-                "-h",
-                conn_config.get("host", "localhost"),
-                "-p",
-                str(conn_config.get("port", 5432)),
-                "-U",
-                conn_config.get("user", "postgres"),
-                "-d",
-                conn_config.get("dbname"),
-                "--no-owner",
-                "--no-privileges",
-                "--verbose",  # Enable verbose output for progress tracking
-                str(dump_file_path),
-            ]
-
-            # Set environment variables
-            env = os.environ.copy()
-            env["PGPASSWORD"] = conn_config.get("password", "")
-
-            self.status_label.text = "Starting database restore..."
-            await asyncio.sleep(0.1)  # Allow UI to update
-
-            # Start the process
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                env=env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+        lock = self._connection_locks[connection_name]
+        if lock.locked():
+            ui.notify(
+                f"A dump or restore of {connection_name} is already running",
+                type="warning",
             )
+            return
 
-            # Monitor progress by reading stderr line by line (pg_restore outputs progress to stderr)
-            stderr_output = []
-            table_count = 0
-            processed_items = 0
+        async with lock:
+            conn_config = self.connections[connection_name]
+            dump_path = Path(conn_config.get("dump_path", ".")).expanduser()
+            dump_file_path = dump_path / dump_file
 
-            async def read_stderr():
-                nonlocal table_count, processed_items
-                try:
-                    while True:
-                        line = await process.stderr.readline()
-                        if not line:
-                            break
-
-                        line_str = line.decode().strip()
-                        if line_str:  # Only process non-empty lines
-                            stderr_output.append(line_str)
-
-                            # Parse progress from pg_restore verbose output
-                            if "processing item" in line_str.lower():
-                                processed_items += 1
-                                self.status_label.text = f"Restoring database... [Processing item {processed_items}]"
-                                await asyncio.sleep(
-                                    0.01
-                                )  # Small delay to allow UI updates
-                            elif "creating table" in line_str.lower():
-                                table_count += 1
-                                # Extract table name if possible
-                                parts = line_str.split()
-                                table_name = ""
-                                if len(parts) > 2:
-                                    table_name = f" - created {parts[-1]}"
-                                self.status_label.text = f"Restoring database... [Created {table_count} tables{table_name}. Continuing...]"
-                                await asyncio.sleep(0.01)
-                            elif "restoring data for table" in line_str.lower():
-                                # Extract table name for data restoration
-                                parts = line_str.split('"')
-                                table_name = parts[1] if len(parts) > 1 else "unknown"
-                                self.status_label.text = f"Restoring database... [Loading data into {table_name}]"
-                                await asyncio.sleep(0.01)
-                            elif "creating index" in line_str.lower():
-                                self.status_label.text = "Restoring database... [Creating indexes and constraints]"
-                                await asyncio.sleep(0.01)
-                except Exception as e:
-                    print(f"Error reading stderr: {e}")
-
-            # Start reading stderr in background
-            stderr_task = asyncio.create_task(read_stderr())
-
-            # Wait for process to complete (only read stdout, stderr is handled above)
-            await process.stdout.read()  # Consume stdout to prevent blocking
-
-            # Wait for process to finish
-            await process.wait()
+            if not dump_file_path.exists():
+                ui.notify("Dump file not found", type="negative")
+                return
 
-            # Wait for stderr reading to complete
-            await stderr_task
+            try:
+                self.show_loading_overlay()
+                self.status_label.text = (
+                    f"Preparing to restore database {conn_config.get('dbname')}..."
+                )
+                await asyncio.sleep(0)  # Allow UI to update
+
+                # Clean database if requested
+                if clean_db:
+                    self.status_label.text = "Cleaning database before restore..."
+                    await asyncio.sleep(0)  # Allow UI to update
+                    success = await self.clean_database(connection_name)
+                    if not success:
+                        self.hide_loading_overlay()
+                        return
 
-            if process.returncode == 0:
-                ui.notify(
-                    f"Database restored successfully from {dump_file}", type="positive"
+                # Build pg_restore command with verbose output; piped dumps are
+                # decompressed into its stdin
+                compress_cmd = conn_config.get("compress_cmd")
+                compressed_extension = self.get_compressed_extension(connection_name)
+                piped = compressed_extension and dump_file.endswith(
+                    compressed_extension
                 )
-                self.status_label.text = f"Restore completed from {dump_file} - {table_count} tables, {processed_items} items processed"
-                # Reset clean checkbox
-                if self.clean_db_checkbox:
-                    self.clean_db_checkbox.value = False
-            else:
-                # Join stderr output for error logging
-                full_error = "\n".join(stderr_output)
-                print("Full restore error output:", full_error)
-                ui.notify("Restore failed: Check console for details", type="negative")
-                self.status_label.text = "Restore failed - check console for details"
+                if piped:
+                    cmd = conn_config["_piped_restore_argv_template"]
+                else:
+                    cmd = (*conn_config["_restore_argv_template"], str(dump_file_path))
+
+                # Password is passed through a private pgpass file; session
+                # settings speed up bulk loading and index builds
+                env = {
+                    **self.get_child_env(connection_name),
+                    "PGOPTIONS": conn_config.get(
+                        "pg_restore_options", DEFAULT_PG_RESTORE_OPTIONS
+                    ),
+                }
+
+                self.status_label.text = "Starting database restore..."
+                await asyncio.sleep(0)  # Allow UI to update
+
+                # Start the process
+                decompressor = None
+                if piped:
+                    read_fd, write_fd = os.pipe()
+                    try:
+                        with open(dump_file_path, "rb") as src:
+                            decompressor = await asyncio.create_subprocess_exec(
+                                *compress_cmd, "-d", stdin=src, stdout=write_fd
+                            )
+                        process = await asyncio.create_subprocess_exec(
+                            *cmd,
+                            env=env,
+                            stdin=read_fd,
+                            stdout=asyncio.subprocess.DEVNULL,
+                            stderr=asyncio.subprocess.PIPE,
+                        )
+                    finally:
+                        # The children hold their own copies of the pipe ends
+                        os.close(read_fd)
+                        os.close(write_fd)
+                else:
+                    process = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        env=env,
+                        stdout=asyncio.subprocess.DEVNULL,  # Restores into -d, nothing on stdout
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+
+                # Monitor progress by reading stderr line by line (pg_restore outputs progress to stderr)
+                stderr_output = deque(maxlen=STDERR_TAIL_LINES)
+                table_count = 0
+                processed_items = 0
+
+                async def read_stderr():
+                    nonlocal table_count, processed_items
+                    update_status, stop_status_updates = self.throttle_status()
+                    try:
+                        async for batch in read_line_batches(process.stderr):
+                            for line in batch:
+                                line = line.strip()
+                                if not line:  # Only process non-empty lines
+                                    continue
+                                # Kept as bytes, only decoded when reported
+                                stderr_output.append(line)
+
+                                # Parse progress from pg_restore verbose output
+                                status = None
+                                match = RESTORE_PROGRESS_RE.search(line)
+                                keyword = match and match.group().lower()
+                                if keyword == b"processing item":
+                                    processed_items += 1
+                                    status = f"Restoring database... [Processing item {processed_items}]"
+                                elif keyword == b"creating table":
+                                    table_count += 1
+                                    # Extract table name if possible
+                                    parts = line.decode(errors="replace").split()
+                                    table_name = ""
+                                    if len(parts) > 2:
+                                        table_name = f" - created {parts[-1]}"
+                                    status = f"Restoring database... [Created {table_count} tables{table_name}. Continuing...]"
+                                elif keyword == b"restoring data for table":
+                                    # Extract table name for data restoration
+                                    parts = line.decode(errors="replace").split('"')
+                                    table_name = (
+                                        parts[1] if len(parts) > 1 else "unknown"
+                                    )
+                                    status = f"Restoring database... [Loading data into {table_name}]"
+                                elif keyword == b"creating index":
+                                    status = "Restoring database... [Creating indexes and constraints]"
+
+                                # Coalesce UI updates instead of pausing the pump
+                                if status:
+                                    update_status(status)
+                    except Exception as e:
+                        print(f"Error reading stderr: {e}")
+                    finally:
+                        stop_status_updates()
+
+                # Read stderr while waiting for the process to finish, stopping
+                # it once the optional time limit is reached
+                timeout = conn_config.get("timeout")
+                started = time.monotonic()
+                finished = await self.wait_while_reading(process, read_stderr, timeout)
+
+                # The decompressor stops once pg_restore closes its end of the
+                # pipe; it shares the time limit with pg_restore
+                if decompressor:
+                    timeout_left = timeout
+                    if timeout is not None:
+                        timeout_left = max(timeout - (time.monotonic() - started), 0)
+                    finished &= await self.wait_for_process(decompressor, timeout_left)
+                    if decompressor.returncode != 0:
+                        stderr_output.append(
+                            f"{compress_cmd[0]} -d exited with code "
+                            f"{decompressor.returncode}".encode()
+                        )
 
-            self.hide_loading_overlay()
+                if process.returncode == 0 and (
+                    decompressor is None or decompressor.returncode == 0
+                ):
+                    ui.notify(
+                        f"Database restored successfully from {dump_file}",
+                        type="positive",
+                    )
+                    self.status_label.text = f"Restore completed from {dump_file} - {table_count} tables, {processed_items} items processed"
+                    # Reset clean checkbox
+                    if self.clean_db_checkbox:
+                        self.clean_db_checkbox.value = False
+                else:
+                    # Join stderr tail for error logging
+                    full_error = b"\n".join(stderr_output).decode(errors="replace")
+                    print(
+                        f"Restore error output (last {STDERR_TAIL_LINES} lines):",
+                        full_error,
+                    )
+                    if finished:
+                        ui.notify(
+                            "Restore failed: Check console for details", type="negative"
+                        )
+                        self.status_label.text = (
+                            "Restore failed - check console for details"
+                        )
+                    else:
+                        ui.notify(
+                            f"Restore timed out after {timeout} seconds",
+                            type="negative",
+                        )
+                        self.status_label.text = (
+                            f"Restore timed out after {timeout} seconds"
+                        )
 
-        except Exception as e:
-            ui.notify(f"Error during restore: {e}", type="negative")
-            self.status_label.text = f"Error during restore: {e}"
-            self.hide_loading_overlay()
+                self.hide_loading_overlay()
+
+            except Exception as e:
+                ui.notify(f"Error during restore: {e}", type="negative")
+                self.status_label.text = f"Error during restore: {e}"
+                self.hide_loading_overlay()
 
     def refresh_restore_dropdown(self):
         """Refresh the restore dropdown with current dump files"""
@@ -471,6 +949,113 @@ class PostgresManager:
 
 # Global manager instance
 manager = PostgresManager()
+app.on_shutdown(manager.close_pools)
+app.on_shutdown(manager.remove_pgpass_files)
+
+
+async def read_line_batches(stream: asyncio.StreamReader) -> AsyncIterator[List[bytes]]:
+    """Yield the complete lines of each chunk read from stream"""
+    pending = b""
+    while chunk := await stream.read(STDERR_CHUNK_SIZE):
+        # A newline byte never occurs inside a multi-byte UTF-8 sequence, so
+        # splitting before decoding is safe
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield lines
+    if pending:
+        yield [pending]
+
+
+@functools.lru_cache(maxsize=1)
+def is_wsl() -> bool:
+    """Check if running in WSL (Windows Subsystem for Linux)"""
+    try:
+        with open("/proc/version", "r") as f:
+            content = f.read().lower()
+            return "microsoft" in content or "wsl" in content
+    except Exception:
+        return False
+
+
+@functools.lru_cache(maxsize=128)
+def convert_wsl_path_to_windows(linux_path: Path) -> str:
+    """Convert WSL Linux path to Windows path"""
+    try:
+        # Use wslpath command to convert Linux path to Windows path
+        result = subprocess.run(
+            ["wslpath", "-w", str(linux_path)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+    except Exception:
+        # Fallback: manual conversion for common cases
+        path_str = str(linux_path)
+        if path_str.startswith("/mnt/"):
+            # /mnt/c/Users/... -> C:\Users\...
+            parts = path_str.split("/")
+            if len(parts) >= 3:
+                drive = parts[2].upper()
+                rest = "/".join(parts[3:])
+                return f"{drive}:\\{rest.replace('/', '\\')}"
+        elif path_str.startswith("/home/"):
+            # /home/user/... -> \\wsl$\Ubuntu\home\user\...
+            return f"\\\\wsl$\\Ubuntu{path_str.replace('/', '\\')}"
+        return path_str
+
+
+# File manager launcher for this platform, None if unsupported
+FILE_MANAGER_CMD = (
+    ("explorer.exe",)
+    if is_wsl()
+    else {
+        "linux": ("xdg-open",),
+        "darwin": ("open",),
+        "win32": ("explorer",),
+    }.get(PLATFORM)
+)
+
+
+def spawn_detached(cmd: List[str]) -> None:
+    """Start cmd in its own session without waiting for it to exit"""
+    subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
+
+
+def debounce(
+    fn: Callable[[], None], ms: int = 150
+) -> Tuple[Callable[[], None], Callable[[], bool]]:
+    """Get a debounced fn and a flush that runs a pending call at once"""
+    timer: ui.timer | None = None
+
+    def run():
+        nonlocal timer
+        timer = None
+        fn()
+
+    def wrapped():
+        nonlocal timer
+        if timer:
+            timer.cancel()
+        timer = ui.timer(ms / 1000, run, once=True)
+
+    def flush() -> bool:
+        nonlocal timer
+        if not timer:
+            return False
+        timer.cancel()
+        timer = None
+        fn()
+        return True
+
+    return wrapped, flush
 
 
 def create_dump_ui():
@@ -479,12 +1064,11 @@ def create_dump_ui():
         ui.label("Dump Mode").classes("text-2xl font-bold mb-4")
 
         # Connection selection
+        names = manager.get_connection_names()
         connection_select = ui.select(
-            options=manager.get_connection_names(),
+            options=list(names),
             label="Select Connection",
-            value=manager.get_connection_names()[0]
-            if manager.get_connection_names()
-            else None,
+            value=names[0] if names else None,
         ).classes("w-full mb-4")
 
         # Dump name input
@@ -501,7 +1085,9 @@ def create_dump_ui():
                     connection_select.value
                 )
 
-        connection_select.on("update:model-value", lambda: update_dump_name())
+        # Cheap enough to run on every change, so the name never lags behind
+        # the selected connection
+        connection_select.on("update:model-value", update_dump_name)
 
         # Initialize dump name
         update_dump_name()
@@ -528,12 +1114,11 @@ def create_restore_ui():
         ui.label("Restore Mode").classes("text-2xl font-bold mb-4")
 
         # Connection selection
+        names = manager.get_connection_names()
         connection_select = ui.select(
-            options=manager.get_connection_names(),
+            options=list(names),
             label="Select Connection",
-            value=manager.get_connection_names()[0]
-            if manager.get_connection_names()
-            else None,
+            value=names[0] if names else None,
         ).classes("w-full mb-4")
 
         # Dump file selection
@@ -545,7 +1130,7 @@ def create_restore_ui():
 
         # Clean DB checkbox
         clean_db_checkbox = ui.checkbox(
-            "Clean DB (Drops all tables)", value=False
+            "Clean DB (Drops public schema)", value=False
         ).classes("mb-4")
         manager.clean_db_checkbox = clean_db_checkbox
 
@@ -554,6 +1139,18 @@ def create_restore_ui():
             "w-full bg-green-600 text-white"
         )
 
+        def load_dump_files():
+            if connection_select.value and not manager.is_restore_prevented(
+                connection_select.value
+            ):
+                dump_files = manager.get_dump_files(connection_select.value)
+                restore_dropdown.options = dump_files
+                restore_dropdown.value = dump_files[0] if dump_files else None
+
+        # Only the directory listing is debounced; everything else follows the
+        # selected connection at once
+        load_dump_files_later, flush_dump_files = debounce(load_dump_files)
+
         def update_restore_ui():
             if connection_select.value:
                 manager.selected_connection = connection_select.value
@@ -585,10 +1182,11 @@ def create_restore_ui():
                     clean_db_checkbox.enable()
                     restore_button.enable()
 
-                    # Load dump files
-                    dump_files = manager.get_dump_files(connection_select.value)
-                    restore_dropdown.options = dump_files
-                    restore_dropdown.value = dump_files[0] if dump_files else None
+                    # Drop the previous connection's dumps until the new
+                    # listing is loaded
+                    restore_dropdown.options = []
+                    restore_dropdown.value = None
+                    load_dump_files_later()
 
                     # Reset status
                     if manager.status_label:
@@ -596,16 +1194,24 @@ def create_restore_ui():
                     if manager.status_footer:
                         manager.status_footer.classes(replace="p-4")
 
-        connection_select.on("update:model-value", lambda: update_restore_ui())
+        connection_select.on("update:model-value", update_restore_ui)
 
         # Initialize restore UI state
         update_restore_ui()
+        flush_dump_files()
 
         # Restore button click handler
         async def do_restore():
             if not connection_select.value:
                 ui.notify("Please select a connection", type="warning")
                 return
+            if flush_dump_files():
+                # The dump list was still being loaded, so the selected file
+                # has not been seen yet
+                ui.notify(
+                    "Dump list updated, please check the selected file", type="warning"
+                )
+                return
             if manager.is_restore_prevented(connection_select.value):
                 ui.notify("Restore is disabled for this connection", type="negative")
                 return
@@ -642,10 +1248,7 @@ def main_page():
                 manager.refresh_dump_name()
             elif tabs.value == restore_tab.label:
                 # When switching to restore tab, check current connection status
-                if (
-                    hasattr(manager, "selected_connection")
-                    and manager.selected_connection
-                ):
+                if manager.selected_connection:
                     if manager.is_restore_prevented(manager.selected_connection):
                         if manager.status_label:
                             manager.status_label.text = (
@@ -670,7 +1273,7 @@ def main_page():
                 create_restore_ui()
 
         # Open dump folder button
-        def open_dump_folder():
+        async def open_dump_folder():
             if manager.selected_connection:
                 conn_config = manager.connections[manager.selected_connection]
                 dump_path = Path(conn_config.get("dump_path", ".")).expanduser()
@@ -678,82 +1281,36 @@ def main_page():
                 # Ensure the directory exists
                 dump_path.mkdir(parents=True, exist_ok=True)
 
-                try:
-                    import platform
-                    import subprocess
-
-                    def is_wsl():
-                        """Check if running in WSL (Windows Subsystem for Linux)"""
-                        try:
-                            with open("/proc/version", "r") as f:
-                                content = f.read().lower()
-                                return "microsoft" in content or "wsl" in content
-                        except Exception:
-                            return False
-
-                    def convert_wsl_path_to_windows(linux_path):
-                        """Convert WSL Linux path to Windows path"""
-                        try:
-                            # Use wslpath command to convert Linux path to Windows path
-                            result = subprocess.run(
-                                ["wslpath", "-w", str(linux_path)],
-                                capture_output=True,
-                                text=True,
-                                check=True,
-                            )
-                            return result.stdout.strip()
-                        except Exception:
-                            # Fallback: manual conversion for common cases
-                            path_str = str(linux_path)
-                            if path_str.startswith("/mnt/"):
-                                # /mnt/c/Users/... -> C:\Users\...
-                                parts = path_str.split("/")
-                                if len(parts) >= 3:
-                                    drive = parts[2].upper()
-                                    rest = "/".join(parts[3:])
-                                    return f"{drive}:\\{rest.replace('/', '\\')}"
-                            elif path_str.startswith("/home/"):
-                                # /home/user/... -> \\wsl$\Ubuntu\home\user\...
-                                return f"\\\\wsl$\\Ubuntu{path_str.replace('/', '\\')}"
-                            return path_str
-
-                    # Determine how to open file manager based on OS and WSL
-                    if is_wsl():
-                        # Running in WSL - use Windows explorer with converted path
-                        windows_path = convert_wsl_path_to_windows(dump_path)
-                        # Note: explorer.exe often returns non-zero exit codes in WSL even on success
-                        subprocess.run(["explorer.exe", windows_path])
-                        ui.notify(
-                            f"Opened dump folder in Windows Explorer: {windows_path}",
-                            type="positive",
-                        )
-                    elif platform.system() == "Linux":
-                        # Native Linux
-                        subprocess.run(["xdg-open", str(dump_path)], check=True)
-                        ui.notify(f"Opened dump folder: {dump_path}", type="positive")
-                    elif platform.system() == "Darwin":  # macOS
-                        subprocess.run(["open", str(dump_path)], check=True)
-                        ui.notify(f"Opened dump folder: {dump_path}", type="positive")
-                    elif platform.system() == "Windows":
-                        # Native Windows
-                        subprocess.run(["explorer", str(dump_path)], check=True)
-                        ui.notify(f"Opened dump folder: {dump_path}", type="positive")
-                    else:
-                        ui.notify(
-                            "Unable to open file manager on this platform",
-                            type="warning",
-                        )
-                        return
+                if FILE_MANAGER_CMD is None:
+                    ui.notify(
+                        "Unable to open file manager on this platform", type="warning"
+                    )
+                    return
+
+                if is_wsl():
+                    # Windows explorer needs the converted path
+                    target = await asyncio.to_thread(
+                        convert_wsl_path_to_windows, dump_path
+                    )
+                else:
+                    target = str(dump_path)
 
-                except subprocess.CalledProcessError as e:
-                    ui.notify(f"Failed to open dump folder: {e}", type="negative")
-                except Exception as e:
-                    ui.notify(f"Error opening dump folder: {e}", type="negative")
+                try:
+                    # Popen still forks and waits for the exec, so keep it off
+                    # the event loop
+                    await asyncio.to_thread(spawn_detached, [*FILE_MANAGER_CMD, target])
+                except OSError as e:
+                    # Missing, not executable or not a valid program
+                    ui.notify(
+                        f"Could not start {FILE_MANAGER_CMD[0]}: {e}", type="negative"
+                    )
+                    return
+                ui.notify(f"Opened dump folder: {target}", type="positive")
             else:
                 ui.notify("Please select a connection first", type="warning")
 
         ui.button("📁 Open Dump Folder", on_click=open_dump_folder).classes(
-            "mt-4 bg-gray-600 hover:bg-gray-700 text-white px-6 py-2 rounded-lg transition-colors"
+            SECONDARY_BUTTON_CLASSES
         )
 
     # Status bar
@@ -768,19 +1325,17 @@ def main_page():
         "fixed inset-0 bg-black/80 flex items-center justify-center z-50"
     )
 
+    # Loading overlay (initially hidden, spinner added on first show)
     loading_overlay.set_visibility(False)
 
-    # Loading overlay (initially hidden)
-    with loading_overlay:
-        ui.spinner("dots", size="xl", color="white")
-
     # Store reference to loading overlay
     manager.loading_overlay = loading_overlay
 
 
 def main():
     """Main entry point"""
-    if not manager.connections:
+    conns = manager.get_connection_names()
+    if not conns:
         print("No database connections found in config.toml")
         print("Please add connections to config.toml in the format:")
         print("""
@@ -792,13 +1347,24 @@ user = "username"
 password = "password"
 dump_path = "/path/to/dump/directory"
 prevent_restore = true # optional
+jobs = 4 # optional, parallel workers (1 = single-file custom format dump)
+parallel = false # optional, same as jobs = 1
+compress_cmd = ["zstd", "-T0", "-q"] # optional, pipe dumps through a compressor (run with -d to restore)
+compress_suffix = ".zst" # optional, appended to piped dump names
+compress_level = "1" # optional, 0-9 or "zstd:LEVEL" (pg_dump 16+), ignored with compress_cmd
+timeout = 3600 # optional, seconds before a dump or restore is stopped (default: no limit)
+pg_restore_options = "-c synchronous_commit=off" # optional, PGOPTIONS for pg_restore
+single_txn = true # optional, restore in one transaction (disables parallel restore)
         """)
         return
 
-    print(f"Loaded {len(manager.connections)} database connections")
-    for name in manager.connections:
-        print(f"  - {name}")
+    names = "\n".join(f"  - {name}" for name in conns)
+    print(f"Loaded {len(conns)} database connections\n{names}")
+    run_server()
+
 
+def run_server():
+    """Start the NiceGUI server"""
     ui.run(
         title="PostgreSQL Manager",
         dark=True,
@@ -808,5 +1374,8 @@ prevent_restore = true # optional
     )
 
 
-if __name__ in ["__main__", "__mp_main__"]:
+if __name__ == "__main__":
     main()
+elif __name__ == "__mp_main__":
+    # Worker process re-importing this module: skip the human-facing banner
+    run_server()